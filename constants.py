@@ -1,20 +1,31 @@
+import math
 from pathlib import Path
 
 # --- General Constants ---
 FLUTE_PARTS_ORDER = ["headjoint", "left", "right", "foot"]
 
 # --- Plotting Constants ---
-# Paleta de colores base (ejemplo de Matplotlib)
-BASE_COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b']
+# Paleta de colores base (ejemplo de Matplotlib). Tuplas inmutables: se usan como valores por defecto de los
+# parámetros de los gráficos y se comparten entre llamadas
+BASE_COLORS = ('#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b')
 # Colormap para cuando hay muchas flautas (ej. > 6)
 COLORMAP_LARGE_NUMBER_OF_FLUTES = 'tab10' # 'viridis', 'tab20'
 
-LINESTYLES = ['-', '--', '-.', ':']
+LINESTYLES = ('-', '--', '-.', ':')
+
+# Máximo de puntos por curva en gráficos superpuestos (se diezma por paso fijo si se supera)
+MAX_POINTS_PER_CURVE = 4000
+# Tolerancia (mm) de la simplificación Ramer-Douglas-Peucker de perfiles del tubo antes de graficar
+PROFILE_DECIMATION_TOL_MM = 0.02
 
 # --- Default Values & Factors ---
 MM_TO_M_FACTOR = 1e-3
 M_TO_MM_FACTOR = 1e3
 
+# --- Physical Constants ---
+# Velocidad del sonido de referencia a 20°C (m/s), usada en los cálculos de B_I/ESPE
+SPEED_OF_SOUND_20C = 331.3 * math.sqrt(1 + 20.0 / 273.15)
+
 # Default acoustic parameters for holes if not specified elsewhere
 DEFAULT_CHIMNEY_HEIGHT = 3e-3 # meters
 DEFAULT_EMBOUCHURE_CHIMNEY_HEIGHT = 5e-3 # meters
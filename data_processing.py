@@ -85,7 +85,7 @@ def save_plots_to_pdf(
                     flute_style=plot_styles[idx]
                 )
             ax_combined_profile.legend(loc='best', title="Flautas")
-            geometrical_pdf.savefig(fig_combined_profile)
+            geometrical_pdf.savefig(fig_combined_profile, dpi=200) # dpi de los perfiles rasterizados
             plt.close(fig_combined_profile)
 
             # Vista 2D (plot_flute_2d_view)
@@ -99,7 +99,7 @@ def save_plots_to_pdf(
                     flute_style=plot_styles[idx]
                 )
             ax_2d_view.legend(loc='best', title="Flautas")
-            geometrical_pdf.savefig(fig_2d_view)
+            geometrical_pdf.savefig(fig_2d_view, dpi=200) # dpi de los perfiles rasterizados
             plt.close(fig_2d_view)
             
             # Geometría del instrumento (plot_instrument_geometry) y Top View (plot_top_view_instrument_geometry)
@@ -182,11 +182,14 @@ def save_plots_to_pdf(
             # Admitancia combinada
             logger.info("Plotting combined admittance...")
             fig_combined_adm = FluteOperations.plot_combined_admittance(acoustic_analysis_data_list)
-            acoustic_pdf.savefig(fig_combined_adm)
+            acoustic_pdf.savefig(fig_combined_adm, dpi=200) # dpi de las curvas rasterizadas
             plt.close(fig_combined_adm)
 
             # Frecuencias antiresonantes
             if ordered_notes_for_plots:
+                # Antirresonancias y métricas de todas las flautas en un solo recorrido, compartidas por los resúmenes
+                summary_metrics = FluteOperations._compute_note_metrics(acoustic_analysis_data_list, finger_frequencies_map_data, ordered_notes_for_plots)
+
                 logger.info("Plotting summary of antiresonances...")
                 fig_antiresonances = FluteOperations.plot_summary_antiresonances(acoustic_analysis_data_list, ordered_notes_for_plots)
                 acoustic_pdf.savefig(fig_antiresonances)
@@ -194,19 +197,22 @@ def save_plots_to_pdf(
             
                 # Diferencias en cents
                 logger.info("Plotting summary of cents differences...")
-                fig_cents = FluteOperations.plot_summary_cents_differences(acoustic_analysis_data_list, ordered_notes_for_plots)
+                fig_cents = FluteOperations.plot_summary_cents_differences(acoustic_analysis_data_list, ordered_notes_for_plots,
+                                                                           antires_cache=summary_metrics["antires"])
                 acoustic_pdf.savefig(fig_cents)
                 plt.close(fig_cents)
             
                 # Gráfico de MOC
                 logger.info("Plotting MOC summary...")
-                fig_moc = FluteOperations.plot_moc_summary(acoustic_analysis_data_list, finger_frequencies_map_data, ordered_notes_for_plots)
+                fig_moc = FluteOperations.plot_moc_summary(acoustic_analysis_data_list, finger_frequencies_map_data, ordered_notes_for_plots,
+                                                           precomputed=summary_metrics)
                 acoustic_pdf.savefig(fig_moc)
                 plt.close(fig_moc)
 
                 # Gráfico de BI y ESPE
                 logger.info("Plotting B_I and ESPE summary...")
-                fig_bi_espe = FluteOperations.plot_bi_espe_summary(acoustic_analysis_data_list, finger_frequencies_map_data, ordered_notes_for_plots)
+                fig_bi_espe = FluteOperations.plot_bi_espe_summary(acoustic_analysis_data_list, finger_frequencies_map_data, ordered_notes_for_plots,
+                                                                   precomputed=summary_metrics)
                 acoustic_pdf.savefig(fig_bi_espe)
                 plt.close(fig_bi_espe)
 
@@ -218,7 +224,7 @@ def save_plots_to_pdf(
                 for note_to_plot in ordered_notes_for_plots:
                     try:
                         fig_indiv_adm = FluteOperations.plot_individual_admittance_analysis(acoustic_analysis_data_list, note_to_plot)
-                        acoustic_pdf.savefig(fig_indiv_adm)
+                        acoustic_pdf.savefig(fig_indiv_adm, dpi=200) # dpi de las curvas rasterizadas
                         plt.close(fig_indiv_adm)
                     except Exception as e_indiv_adm:
                         logger.error(f"Error graficando admitancia individual para nota {note_to_plot}: {e_indiv_adm}")
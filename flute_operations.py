@@ -1,33 +1,306 @@
+import os
+import matplotlib
+# Modo por lotes (exportación de PDF sin interfaz): TRAVERSO_BATCH=1 fuerza el backend Agg
+# y desactiva el aviso de demasiadas figuras abiertas (en lote se crean y cierran muchas).
+# Las aplicaciones Tk (gui.py, flute_experimenter.py, ...) no deben definir esta variable.
+if os.environ.get("TRAVERSO_BATCH") == "1":
+    matplotlib.use("Agg", force=False)
+    matplotlib.rcParams["figure.max_open_warning"] = 0
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
-# import os # No se usa actualmente
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.collections import EllipseCollection, LineCollection, PolyCollection
+from matplotlib.lines import Line2D
 from openwind import ImpedanceComputation, Player, InstrumentGeometry # type: ignore
 import numpy as np
 # from matplotlib.cm import tab10 # No se usa directamente
+import functools
+import hashlib
 import logging
-from typing import Any, List, Tuple, Optional, Dict
+import weakref
+from collections import OrderedDict
+from typing import Any, List, Tuple, Optional, Dict, Sequence, Union
+
+try:
+    from numba import njit # type: ignore
+except ImportError: # numba es opcional: sin él los kernels se ejecutan como NumPy vectorizado
+    def njit(*args: Any, **kwargs: Any) -> Any:
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
 
 from constants import (
     BASE_COLORS, LINESTYLES, FLUTE_PARTS_ORDER,
-    M_TO_MM_FACTOR
+    M_TO_MM_FACTOR, SPEED_OF_SOUND_20C, MAX_POINTS_PER_CURVE, PROFILE_DECIMATION_TOL_MM
 )
 # Necesitas FluteData aquí si FluteOperations lo usa como tipo, pero solo se pasa como 'Any' en __init__
 # from flute_data import FluteData # Descomentar si se usa FluteData como tipo explícito
 
 logger = logging.getLogger(__name__)
 
+# Caché por objeto ImpedanceComputation: los gráficos de resumen y el análisis individual
+# consultan las mismas antirresonancias y modos muchas veces por redibujado.
+# WeakKeyDictionary indexa por identidad del objeto y libera la entrada cuando el análisis se descarta.
+_ANTIRES_CACHE: "weakref.WeakKeyDictionary[ImpedanceComputation, Tuple[float, ...]]" = weakref.WeakKeyDictionary()
+_PRESSURE_FLOW_CACHE: "weakref.WeakKeyDictionary[ImpedanceComputation, Tuple[np.ndarray, np.ndarray, np.ndarray]]" = weakref.WeakKeyDictionary()
+
+# Colecciones de plot_combined_admittance por eje: (análisis dibujados, una LineCollection por flauta). Permite redibujar
+# sobre el mismo eje cambiando solo el estilo, sin ax.clear() ni recalcular las curvas, mientras los análisis sean los mismos.
+_COMBINED_ADMITTANCE_ARTISTS: "weakref.WeakKeyDictionary[plt.Axes, Tuple[Tuple[Any, ...], List[LineCollection]]]" = weakref.WeakKeyDictionary()
+
+# PDF de resumen ya generados, indexados por el contenido que dibujan (ver _summary_pdf_key).
+# Solo en memoria: una caché en disco podría servir reportes de una versión anterior del código.
+_SUMMARY_PDF_CACHE: "OrderedDict[str, bytes]" = OrderedDict()
+_SUMMARY_PDF_CACHE_SIZE = 8
+
+# Circunferencia unitaria (50 puntos, columnas cos/sin) usada para dibujar los agujeros; se calcula una vez al importar
+_THETA_50 = np.linspace(0, 2 * np.pi, 50)
+_UNIT_CIRCLE_50 = np.column_stack((np.cos(_THETA_50), np.sin(_THETA_50)))
+_UNIT_CIRCLE_50.setflags(write=False)
+
+def _get_antires(analysis_obj: ImpedanceComputation) -> Tuple[float, ...]:
+    """Devuelve (con caché) las frecuencias antirresonantes de un análisis."""
+    antires = _ANTIRES_CACHE.get(analysis_obj)
+    if antires is None:
+        antires = tuple(analysis_obj.antiresonance_frequencies())
+        _ANTIRES_CACHE[analysis_obj] = antires
+    return antires
+
+def _get_pressure_flow(analysis_obj: ImpedanceComputation) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Devuelve (con caché) la tupla (x, presión, flujo) de get_pressure_flow() de un análisis."""
+    pressure_flow = _PRESSURE_FLOW_CACHE.get(analysis_obj)
+    if pressure_flow is None:
+        pressure_flow = tuple(analysis_obj.get_pressure_flow())
+        _PRESSURE_FLOW_CACHE[analysis_obj] = pressure_flow
+    return pressure_flow
+
+def _antires_pairs(analysis_dict: Dict[str, ImpedanceComputation], notes_ordered: List[str]) -> np.ndarray:
+    """
+    Devuelve un ndarray (len(notes_ordered), 2) con las dos primeras antirresonancias de cada nota.
+    Las notas sin análisis válido o con menos de dos antirresonancias quedan en NaN.
+    """
+    def first_two(note: str) -> Tuple[float, float]:
+        analysis_obj = analysis_dict.get(note)
+        if isinstance(analysis_obj, ImpedanceComputation):
+            antires_freqs = _get_antires(analysis_obj)
+            if len(antires_freqs) >= 2:
+                return antires_freqs[0], antires_freqs[1]
+        return np.nan, np.nan
+    return np.fromiter((first_two(note) for note in notes_ordered), dtype=np.dtype((float, 2)), count=len(notes_ordered))
+
+def _collect_antires(acoustic_analysis_list: List[Tuple[Dict[str, ImpedanceComputation], str]],
+                     notes_ordered: List[str]) -> np.ndarray:
+    """ndarray (n_flautas, n_notas, 2) con las dos primeras antirresonancias de cada flauta y nota (NaN si faltan)."""
+    antires = np.full((len(acoustic_analysis_list), len(notes_ordered), 2), np.nan)
+    for index, (analysis_dict, _) in enumerate(acoustic_analysis_list):
+        antires[index] = _antires_pairs(analysis_dict, notes_ordered)
+    return antires
+
+def _admittance_db(impedance: np.ndarray) -> np.ndarray:
+    """
+    Admitancia en dB (20·log10|1/Z| = -10·log10|Z|²) sin raíz cuadrada: |Z|² se obtiene de las partes real e
+    imaginaria y se limita a 1e-24 (|Z| >= 1e-12) para evitar log(0). El resto se hace en el mismo array.
+    """
+    admittance = np.square(impedance.real)
+    admittance += np.square(impedance.imag)
+    np.maximum(admittance, 1e-24, out=admittance)
+    np.log10(admittance, out=admittance)
+    admittance *= -10
+    return admittance
+
+def _admittance_plot_indices(analysis_obj: ImpedanceComputation, max_points: int = MAX_POINTS_PER_CURVE) -> Union[slice, np.ndarray]:
+    """
+    Índices a dibujar de una curva de admitancia: submuestreo uniforme a ~max_points más los puntos más cercanos
+    a las antirresonancias, para que el diezmado no recorte los picos. Sin diezmado devuelve slice(None).
+    """
+    frequencies = np.asarray(analysis_obj.frequencies, dtype=float)
+    stride = frequencies.size // max_points
+    if stride <= 1:
+        return slice(None)
+    keep = np.arange(0, frequencies.size, stride)
+    antires = np.asarray(_get_antires(analysis_obj), dtype=float)
+    if antires.size:
+        keep = np.union1d(keep, _nearest_indices(frequencies, antires))
+    return keep
+
+def _decimate_profile(positions: np.ndarray, values: np.ndarray, tol_mm: float = PROFILE_DECIMATION_TOL_MM) -> np.ndarray:
+    """
+    Máscara booleana de los vértices a conservar de un perfil (Ramer-Douglas-Peucker, iterativo).
+    Se descartan los puntos que se apartan menos de tol_mm de la recta entre los vértices conservados.
+    """
+    n_points = positions.size
+    keep = np.zeros(n_points, dtype=bool)
+    if n_points <= 2:
+        keep[:] = True
+        return keep
+    keep[0] = keep[-1] = True
+    pending = [(0, n_points - 1)]
+    while pending:
+        start, end = pending.pop()
+        if end - start < 2: continue
+        dx, dy = positions[end] - positions[start], values[end] - values[start]
+        rel_x = positions[start + 1:end] - positions[start]
+        rel_y = values[start + 1:end] - values[start]
+        chord = np.hypot(dx, dy)
+        dist = np.abs(dx * rel_y - dy * rel_x) / chord if chord > 0 else np.hypot(rel_x, rel_y)
+        farthest = int(np.argmax(dist))
+        if dist[farthest] > tol_mm:
+            split = start + 1 + farthest
+            keep[split] = True
+            pending.append((start, split)); pending.append((split, end))
+    return keep
+
+def _finish_layout(fig: plt.Figure) -> None:
+    """tight_layout solo para figuras sin motor de layout (ejes del llamador); las creadas aquí usan 'constrained'."""
+    if fig.get_layout_engine() is None:
+        fig.tight_layout()
+
+def _new_agg_figure(figsize: Tuple[float, float]) -> Tuple[Figure, plt.Axes]:
+    """Figura (layout 'constrained') con lienzo Agg propio, fuera del gestor global de pyplot (no requiere plt.close)."""
+    fig = Figure(figsize=figsize, layout='constrained')
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+def _summary_pdf_key(metrics: Dict[str, np.ndarray], flute_names: List[str], notes_ordered: List[str]) -> str:
+    """Hash del contenido del PDF de resumen: los gráficos dependen solo de las métricas, los nombres y las notas."""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr((tuple(flute_names), tuple(notes_ordered))).encode())
+    for key in sorted(metrics):
+        digest.update(key.encode()); digest.update(np.ascontiguousarray(metrics[key]).tobytes())
+    return digest.hexdigest()
+
+@functools.lru_cache(maxsize=64)
+def _marker_legend_proxy(color: Any) -> Line2D:
+    """
+    Artista de leyenda (marcador 'o' sin línea) para un color; compartido entre llamadas porque la leyenda
+    solo copia sus propiedades. La etiqueta se pasa aparte a ax.legend.
+    """
+    return Line2D([0], [0], marker='o', color=color, linestyle='None', markersize=6)
+
+@functools.lru_cache(maxsize=64)
+def _mirrored_shape_path(x_bytes: bytes, r_bytes: bytes, mmeter_conversion: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Trayectoria (posición, radio) del perfil superior + NaN + perfil inferior invertido.
+    Se indexa por el contenido de los arrays (bytes) porque los llamadores pasan arrays nuevos en cada redibujado.
+    Los arrays devueltos se comparten entre llamadas y son de solo lectura.
+    """
+    x_m = np.frombuffer(x_bytes, dtype=float)
+    r_m = np.frombuffer(r_bytes, dtype=float)
+    # Arrays de salida reservados una vez y rellenados por tramos (vistas invertidas, sin copias intermedias)
+    n_points = x_m.size
+    position_to_plot = np.empty(2 * n_points + 1)
+    radius_to_plot = np.empty(2 * n_points + 1)
+    position_to_plot[:n_points] = x_m; position_to_plot[n_points] = np.nan; position_to_plot[n_points + 1:] = x_m[::-1]
+    radius_to_plot[:n_points] = r_m; radius_to_plot[n_points] = np.nan; np.negative(r_m[::-1], out=radius_to_plot[n_points + 1:])
+    position_to_plot *= mmeter_conversion; radius_to_plot *= mmeter_conversion
+    position_to_plot.setflags(write=False); radius_to_plot.setflags(write=False)
+    return position_to_plot, radius_to_plot
+
+# --- Kernels numéricos por nota ---
+# Reciben arrays float64 1-D (uno por nota) y devuelven NaN donde el cálculo no es válido.
+# Se compilan con numba si está instalado; las llamadas se envuelven en np.errstate para el caso NumPy.
+# Sin fastmath (supone que no hay NaN y rompería las máscaras) ni parallel (pocas notas: no compensa).
+
+@njit(cache=True)
+def _compute_cents(f_meas: np.ndarray, f_target: np.ndarray) -> np.ndarray:
+    """Intervalo en cents de f_meas respecto de f_target (1200·log2 del cociente)."""
+    return 1200.0 * np.log2(f_meas / f_target)
+
+@njit(cache=True)
+def _nearest_indices(sorted_values: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """Índices de los valores más cercanos a cada target en un array ordenado (búsqueda binaria; empates al menor)."""
+    if sorted_values.size == 0:
+        return np.zeros(targets.size, dtype=np.int64)
+    idx = np.searchsorted(sorted_values, targets)
+    prev_idx = np.maximum(idx - 1, 0)
+    next_idx = np.minimum(idx, sorted_values.size - 1)
+    use_prev = (idx > 0) & ((idx == sorted_values.size) |
+                            (np.abs(sorted_values[prev_idx] - targets) <= np.abs(sorted_values[next_idx] - targets)))
+    return np.where(use_prev, idx - 1, idx)
+
+@njit(cache=True)
+def _cents_kernel(f0: np.ndarray, f1: np.ndarray) -> np.ndarray:
+    """Inharmonicidad en cents entre la segunda antirresonancia y el doble de la primera."""
+    return np.where((f0 > 0) & (f1 > 0), _compute_cents(f1, 2.0 * f0), np.nan)
+
+@njit(cache=True)
+def _moc_kernel(f0: np.ndarray, f1: np.ndarray, f_play: np.ndarray) -> np.ndarray:
+    """MOC por nota a partir de las dos primeras antirresonancias y la frecuencia de digitación."""
+    # Las comparaciones con NaN son False, así que las notas sin datos quedan fuera de la máscara
+    valid = (f_play > 0) & (f0 > 0) & (f1 > 0) & (f0 != f_play) & (f1 != 2.0 * f_play)
+    num_term = (1.0 / f1) - (1.0 / (2.0 * f_play))
+    den_term = (1.0 / f0) - (1.0 / f_play)
+    return np.where(valid & (np.abs(den_term) > 1e-9), num_term / den_term, np.nan)
+
+@njit(cache=True)
+def _bi_espe_kernel(f0: np.ndarray, f1: np.ndarray, f_play_I: np.ndarray, speed_of_sound: float) -> Tuple[np.ndarray, np.ndarray]:
+    """B_I y ESPE (en cents) por nota."""
+    # Notas con frecuencia de digitación válida y al menos dos antirresonancias
+    has_data = (f_play_I > 0) & ~np.isnan(f0)
+    bi_vals = np.where(has_data & (f0 > 0), _compute_cents(f_play_I, f0), np.nan)
+    # Recíprocos y c/2 una sola vez; 1/f_play_II = 0.5/f_play_I
+    half_c = 0.5 * speed_of_sound
+    inv_play_I = 1.0 / f_play_I
+    delta_l_I = np.where(f0 > 0, half_c * (inv_play_I - 1.0 / f0), 0.0)
+    delta_l_II = np.where(f1 > 0, speed_of_sound * (0.5 * inv_play_I - 1.0 / f1), 0.0)
+    delta_delta_l = delta_l_II - delta_l_I
+    L_eff_I = half_c * inv_play_I
+    espe_vals = np.where(has_data & (L_eff_I + delta_delta_l > 1e-9),
+                         _compute_cents(L_eff_I, L_eff_I + delta_delta_l), np.nan)
+    return bi_vals, espe_vals
+
 class FluteOperations:
     def __init__(self, flute_data_instance: Any) -> None: # flute_data_instance es una instancia de FluteData
         self.flute_data = flute_data_instance
+        # Artistas de plot_all_parts_overlapping (parte -> (línea, scatter de agujeros)) para redibujar sin ax.clear()
+        self._overlap_ax: Optional[plt.Axes] = None
+        self._overlap_artists: Dict[str, Tuple[Any, Any]] = {}
 
-    def _calculate_adjusted_positions(self, part: str, current_position: float) -> Tuple[List[float], List[float]]:
+    def _calculate_adjusted_positions(self, part: str, current_position: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Devuelve (posiciones desplazadas en current_position, diámetros) de una parte como ndarrays.
+        No se cachea: los editores modifican y reordenan las mediciones en su lugar.
+        """
         # Asegurarse que self.flute_data.data[part] existe y tiene 'measurements'
         part_data = self.flute_data.data.get(part, {})
         measurements = part_data.get("measurements", [])
-        positions = [item.get("position", 0.0) for item in measurements]
-        diameters = [item.get("diameter", 0.0) for item in measurements]
-        adjusted_positions = [pos + current_position for pos in positions]
-        return adjusted_positions, diameters
+        pos_diam = np.fromiter(((item.get("position", 0.0), item.get("diameter", 0.0)) for item in measurements),
+                               dtype=np.dtype((float, 2)), count=len(measurements))
+        return pos_diam[:, 0] + current_position, pos_diam[:, 1]
+
+    def _combined_measurements_array(self) -> np.ndarray:
+        """
+        Devuelve combined_measurements como ndarray (N, 2) [posición, diámetro] en mm.
+        Se calcula una sola vez y se guarda en flute_data; se recalcula si la lista cambia.
+        """
+        combined_measurements = self.flute_data.combined_measurements
+        cm_array = getattr(self.flute_data, "_cm_array", None)
+        if cm_array is None or getattr(self.flute_data, "_cm_array_source", None) is not combined_measurements \
+                or len(cm_array) != len(combined_measurements):
+            cm_array = FluteOperations._measurements_to_array(combined_measurements)
+            self.flute_data._cm_array = cm_array
+            self.flute_data._cm_array_source = combined_measurements
+        return cm_array
+
+    def _combined_profile_decimated(self) -> np.ndarray:
+        """
+        combined_measurements simplificado para graficar (ver _decimate_profile), ndarray (M, 2) [posición, diámetro].
+        Se guarda en flute_data junto a _cm_array y se recalcula cuando éste cambia; los datos originales no se tocan.
+        """
+        cm_array = self._combined_measurements_array()
+        decimated = getattr(self.flute_data, "_cm_decimated", None)
+        if decimated is None or getattr(self.flute_data, "_cm_decimated_source", None) is not cm_array:
+            # Se simplifica sobre el radio: es lo que se dibuja en las vistas con aspecto 1:1
+            decimated = cm_array[_decimate_profile(cm_array[:, 0], cm_array[:, 1] / 2.0)]
+            self.flute_data._cm_decimated = decimated
+            self.flute_data._cm_decimated_source = cm_array
+        return decimated
+
+    @staticmethod
+    def _measurements_to_array(combined_measurements: List[Dict[str, float]]) -> np.ndarray:
+        """Convierte una lista de mediciones {'position', 'diameter'} en un ndarray (N, 2)."""
+        return np.fromiter(((d["position"], d["diameter"]) for d in combined_measurements),
+                           dtype=np.dtype((float, 2)), count=len(combined_measurements))
 
     def plot_individual_parts(self, axes_list: Optional[List[plt.Axes]] = None,
                               figure_title: Optional[str] = None,
@@ -72,10 +345,13 @@ class FluteOperations:
             hole_positions = part_data.get("Holes position", [])
             hole_diameters = part_data.get("Holes diameter", [])
             if hole_positions and hole_diameters:
-                y_pos_for_holes = min(diameters) - 5 if diameters else -5
-                for pos, diam in zip(hole_positions, hole_diameters):
-                    current_ax.plot(pos, y_pos_for_holes, color=color_to_use,
-                                    marker='o', markersize=max(diam * 0.5, 2), linestyle='None')
+                y_pos_for_holes = float(diameters.min()) - 5 if diameters.size else -5.0
+                # Todos los agujeros en un solo scatter (s es área: markersize²)
+                n_holes = min(len(hole_positions), len(hole_diameters))
+                hole_positions_arr = np.asarray(hole_positions[:n_holes], dtype=float)
+                marker_sizes = np.maximum(np.asarray(hole_diameters[:n_holes], dtype=float) * 0.5, 2)
+                current_ax.scatter(hole_positions_arr, np.full_like(hole_positions_arr, y_pos_for_holes),
+                                   s=marker_sizes ** 2, color=color_to_use, marker='o', zorder=2)
 
             current_ax.set_xlabel("Posición (mm)")
             current_ax.set_ylabel("Diámetro (mm)")
@@ -98,41 +374,77 @@ class FluteOperations:
                                    plot_label: Optional[str] = None,
                                    flute_color: Optional[str] = None, flute_style: Optional[str] = None) -> plt.Axes:
         fig: plt.Figure
+        ax_provided = ax is not None
         if ax is None:
             fig, ax = plt.subplots(figsize=(18, 6))
         else:
             fig = ax.figure
-            ax.clear() # Limpiar el eje si se reutiliza
 
         current_position = 0.0
         actual_flute_name = self.flute_data.flute_model
         label_to_use = plot_label if plot_label else actual_flute_name
+        color_to_use = flute_color if flute_color else BASE_COLORS[0]
+        style_to_use = flute_style if flute_style else LINESTYLES[0]
 
-        for i, part_name in enumerate(FLUTE_PARTS_ORDER):
+        # (parte, posiciones, diámetros, posiciones de agujeros, y de agujeros, tamaños de marcador) por parte con datos
+        parts_to_draw = []
+        for part_name in FLUTE_PARTS_ORDER:
             part_data = self.flute_data.data.get(part_name, {})
             if not part_data: continue
 
             adjusted_positions, diameters = self._calculate_adjusted_positions(part_name, current_position)
-            # Solo etiquetar la primera parte para la leyenda general de esta flauta
-            current_part_label = label_to_use if i == 0 else None
-
-            ax.plot(adjusted_positions, diameters, marker='o',
-                    linestyle=flute_style if flute_style else LINESTYLES[0],
-                    color=flute_color if flute_color else BASE_COLORS[0],
-                    markersize=4, label=current_part_label)
-
             hole_positions = part_data.get("Holes position", [])
             hole_diameters = part_data.get("Holes diameter", [])
+            holes = None
             if hole_positions and hole_diameters: # No dibujar si no hay diámetros de tubo
-                y_pos_for_holes = min(diameters) - 5 if diameters else -5
-                for pos, diam in zip(hole_positions, hole_diameters):
-                    ax.plot(pos + current_position, y_pos_for_holes,
-                            color=flute_color if flute_color else BASE_COLORS[0],
-                            marker='o', markersize=max(diam * 0.5, 2), linestyle='None')
+                y_pos_for_holes = float(diameters.min()) - 5 if diameters.size else -5.0
+                # Todos los agujeros de la parte en un solo scatter (s es área: markersize²)
+                n_holes = min(len(hole_positions), len(hole_diameters))
+                hole_positions_arr = np.asarray(hole_positions[:n_holes], dtype=float) + current_position
+                marker_sizes = np.maximum(np.asarray(hole_diameters[:n_holes], dtype=float) * 0.5, 2)
+                holes = (np.column_stack((hole_positions_arr, np.full_like(hole_positions_arr, y_pos_for_holes))), marker_sizes ** 2)
+            parts_to_draw.append((part_name, adjusted_positions, diameters, holes))
 
             total_length = part_data.get("Total length", 0.0)
             current_position += total_length
 
+        # Redibujo sobre los mismos ejes: se actualizan los artistas existentes (set_data/set_offsets)
+        # en vez de ax.clear() + ax.plot. Solo si siguen en el eje y las partes (y sus agujeros) coinciden.
+        cached = self._overlap_artists if self._overlap_ax is ax else {}
+        reuse_artists = [name for name, *_ in parts_to_draw] == list(cached) and all(
+            cached[name][0] in ax.lines and
+            ((holes is None and cached[name][1] is None) or
+             (holes is not None and cached[name][1] is not None and cached[name][1] in ax.collections))
+            for name, _, _, holes in parts_to_draw)
+
+        if reuse_artists:
+            for i, (part_name, adjusted_positions, diameters, holes) in enumerate(parts_to_draw):
+                line, holes_scatter = cached[part_name]
+                line.set_data(adjusted_positions, diameters)
+                line.set_color(color_to_use); line.set_linestyle(style_to_use)
+                # Solo etiquetar la primera parte para la leyenda general de esta flauta
+                line.set_label(label_to_use if i == 0 else None)
+                if holes_scatter is not None:
+                    holes_scatter.set_offsets(holes[0]); holes_scatter.set_sizes(holes[1]); holes_scatter.set_color(color_to_use)
+            ax.relim() # relim no considera las colecciones: se añaden los agujeros a mano
+            for _, holes_scatter in cached.values():
+                if holes_scatter is not None: ax.update_datalim(holes_scatter.get_offsets())
+            ax.autoscale_view()
+        else:
+            if ax_provided: ax.clear() # Limpiar el eje si se reutiliza
+            self._overlap_artists = {}
+            for i, (part_name, adjusted_positions, diameters, holes) in enumerate(parts_to_draw):
+                # Solo etiquetar la primera parte para la leyenda general de esta flauta
+                current_part_label = label_to_use if i == 0 else None
+                line, = ax.plot(adjusted_positions, diameters, marker='o',
+                                linestyle=style_to_use, color=color_to_use,
+                                markersize=4, label=current_part_label)
+                holes_scatter = None
+                if holes is not None:
+                    holes_scatter = ax.scatter(holes[0][:, 0], holes[0][:, 1], s=holes[1], color=color_to_use, marker='o', zorder=2)
+                self._overlap_artists[part_name] = (line, holes_scatter)
+            self._overlap_ax = ax
+
         ax.set_xlabel("Posición Acumulada (mm)")
         ax.set_ylabel("Diámetro (mm)")
         if label_to_use: ax.legend(loc='best', fontsize=9)
@@ -179,7 +491,7 @@ class FluteOperations:
 
                 ax.plot(current_segment_positions, current_segment_diameters,
                         linestyle=flute_style if flute_style else LINESTYLES[0],
-                        color=segment_color, label=current_plot_segment_label)
+                        color=segment_color, label=current_plot_segment_label, rasterized=True)
                 if current_plot_segment_label: flute_label_applied = True
 
                 last_plotted_point_data = {"position": current_segment_positions[-1],
@@ -200,7 +512,7 @@ class FluteOperations:
                 part_color_idx = FLUTE_PARTS_ORDER.index(current_segment_part_name) if current_segment_part_name in FLUTE_PARTS_ORDER else 0
                 segment_color = flute_color if flute_color else BASE_COLORS[part_color_idx % len(BASE_COLORS)] # Usar flute_color si se proporciona
                 current_plot_segment_label = label_to_use if not flute_label_applied else None
-                ax.plot(current_segment_positions, current_segment_diameters, linestyle=flute_style if flute_style else LINESTYLES[0], color=segment_color, label=current_plot_segment_label)
+                ax.plot(current_segment_positions, current_segment_diameters, linestyle=flute_style if flute_style else LINESTYLES[0], color=segment_color, label=current_plot_segment_label, rasterized=True)
         
         if show_mortise_markers: # Las posiciones para vlines también necesitarían el offset
             # current_abs_offset es el punto de unión para la SIGUIENTE parte,
@@ -315,9 +627,8 @@ class FluteOperations:
                 current_physical_plot_start_abs = 0.0
             elif i == 1: # Left (se inserta en Headjoint)
                 # Left comienza donde termina el cuerpo de Headjoint (antes del socket de HJ)
-                hj_data = self.flute_data.data.get(FLUTE_PARTS_ORDER[0], {})
-                hj_total_length = hj_data.get("Total length", 0.0)
-                hj_mortise_length = hj_data.get("Mortise length", 0.0)
+                hj_total_length = headjoint_data_for_stopper.get("Total length", 0.0)
+                hj_mortise_length = headjoint_data_for_stopper.get("Mortise length", 0.0)
                 current_physical_plot_start_abs = hj_total_length - hj_mortise_length
             else: # Right, Foot (se insertan en la anterior)
                 # El inicio físico de Right/Foot es el final físico de Left/Right menos el socket de Right/Foot
@@ -451,19 +762,20 @@ class FluteOperations:
             ax.set_title("Vista 2D de la Flauta" + (f" - {self.flute_data.flute_model}" if self.flute_data.flute_model else ""))
             return ax
 
-        positions = [item["position"] for item in combined_measurements]
-        diameters = [item["diameter"] for item in combined_measurements]
+        cm_array = self._combined_profile_decimated() # Simplificado y cacheado en flute_data
+        positions = np.ascontiguousarray(cm_array[:, 0])
+        radii = cm_array[:, 1] / 2.0
+        # Perfil superior + NaN + inferior invertido en un solo trazo (misma ruta cacheada que _plot_shape_static)
+        outline_x, outline_r = _mirrored_shape_path(positions.tobytes(), radii.tobytes(), 1.0)
 
         label_to_use = plot_label if plot_label else self.flute_data.flute_model
 
-        ax.plot(positions, [d / 2.0 for d in diameters],
+        # Perfil rasterizado en PDF/SVG (ejes y textos siguen vectoriales): con muchas flautas superpuestas
+        # evita emitir miles de segmentos de trazo
+        ax.plot(outline_x, outline_r,
                 color=flute_color if flute_color else BASE_COLORS[0],
                 linestyle=flute_style if flute_style else LINESTYLES[0],
-                linewidth=2, label=label_to_use)
-        ax.plot(positions, [-d / 2.0 for d in diameters],
-                color=flute_color if flute_color else BASE_COLORS[0],
-                linestyle=flute_style if flute_style else LINESTYLES[0],
-                linewidth=2)
+                linewidth=2, label=label_to_use, rasterized=True)
 
         ax.set_xlabel("Posición (mm)")
         ax.set_ylabel("Radio (mm)")
@@ -516,10 +828,9 @@ class FluteOperations:
     @staticmethod
     def _plot_shape_static(shape_data: Tuple[np.ndarray, np.ndarray], ax: plt.Axes, mmeter_conversion: float, **kwargs: Any) -> None:
         x_m, r_m = shape_data
-        x_plot = x_m * mmeter_conversion
-        r_plot = r_m * mmeter_conversion
-        radius_to_plot = np.concatenate([r_plot, [np.nan], np.flip(-r_plot)])
-        position_to_plot = np.concatenate([x_plot, [np.nan], np.flip(x_plot)])
+        position_to_plot, radius_to_plot = _mirrored_shape_path(
+            np.ascontiguousarray(x_m, dtype=float).tobytes(), np.ascontiguousarray(r_m, dtype=float).tobytes(),
+            float(mmeter_conversion))
         ax.plot(position_to_plot, radius_to_plot, **kwargs)
 
     @staticmethod
@@ -530,25 +841,69 @@ class FluteOperations:
         default_color: str = 'black',
         **kwargs: Any) -> None:
         try:
-            theta = np.linspace(0, 2 * np.pi, 50)
-            for hole_detail in holes_info:
-                pos_m = hole_detail['position_m']
-                rad_m = hole_detail['radius_m']
-                is_open = hole_detail.get('is_open', True)
-                x_center_plot = pos_m * mmeter_conversion
-                rad_plot = rad_m * mmeter_conversion
-                x_circle_plot = x_center_plot + rad_plot * np.cos(theta)
-                y_circle_plot = rad_plot * np.sin(theta) 
-                plot_kwargs = kwargs.copy()
-                current_color = plot_kwargs.pop('color', default_color) 
-                if is_open:
-                    ax.plot(x_circle_plot, y_circle_plot, color=current_color, solid_capstyle='round', **plot_kwargs)
-                else:
-                    ax.fill(x_circle_plot, y_circle_plot, color=current_color, **plot_kwargs) # Removed solid_capstyle for fill
+            if not holes_info: return
+            # Todos los agujeros en dos colecciones (abiertos: contorno, cerrados: relleno) en vez de un artista por agujero
+            centers = np.array([[hole_detail['position_m'] * mmeter_conversion, 0.0] for hole_detail in holes_info])
+            radii = np.array([hole_detail['radius_m'] * mmeter_conversion for hole_detail in holes_info])
+            is_open = np.array([hole_detail.get('is_open', True) for hole_detail in holes_info], dtype=bool)
+            circles = centers[:, None, :] + radii[:, None, None] * _UNIT_CIRCLE_50 # (n_agujeros, 50, 2)
+            plot_kwargs = kwargs.copy()
+            current_color = plot_kwargs.pop('color', default_color) 
+            if is_open.any():
+                ax.add_collection(LineCollection(circles[is_open], colors=current_color, capstyle='round', zorder=2, **plot_kwargs))
+            if not is_open.all():
+                ax.add_collection(PolyCollection(circles[~is_open], facecolors=current_color, edgecolors=current_color, zorder=2, **plot_kwargs))
+            ax.autoscale_view()
         except Exception as e:
             logger.error(f"Error graficando agujeros (estático): {e}")
 
 
+    @staticmethod
+    def _draw_top_view(ax: plt.Axes, note: str, analysis_obj: ImpedanceComputation,
+                       bore_mm: Optional[np.ndarray], model_name: str) -> None:
+        """Dibuja el tubo (bore_mm: ndarray (N, 2) [posición, diámetro] en mm) y los agujeros de una nota en vista superior."""
+        instrument_geometry = analysis_obj.get_instrument_geometry()
+        if not instrument_geometry:
+            msg = f"No hay datos de geometría para nota '{note}'"
+            logger.error(f"{msg} en {model_name}.")
+            ax.text(0.5,0.5, msg, ha='center', transform=ax.transAxes)
+            return
+
+        # Dibujar el perfil del tubo principal usando combined_measurements
+        if bore_mm is not None and len(bore_mm):
+            try:
+                positions_mm = bore_mm[:, 0]
+                radii_mm = bore_mm[:, 1] * 0.5
+                # Perfil superior e inferior en un solo Line2D (separados por NaN), como en _plot_shape_static
+                xs = np.concatenate([positions_mm, [np.nan], positions_mm])
+                ys = np.concatenate([radii_mm, [np.nan], -radii_mm])
+                ax.plot(xs, ys, color='black', linestyle='-', linewidth=1)
+            except Exception as e_plot_bore:
+                logger.error(f"Error al dibujar el tubo principal usando combined_measurements para {model_name}: {e_plot_bore}")
+                ax.text(0.5, 0.5, "Error al dibujar tubo", ha='center', va='center', transform=ax.transAxes, color='red')
+        else:
+            logger.warning(f"No hay mediciones combinadas para {model_name} para dibujar el tubo en vista superior.")
+            ax.text(0.5, 0.5, "Error: Geometría del tubo no disponible", ha='center', va='center', transform=ax.transAxes)
+
+        try:
+            holes = instrument_geometry.holes
+            fingering = instrument_geometry.fingering_chart.fingering_of(note)
+            xs_mm = np.fromiter((hole_obj.position.get_value() for hole_obj in holes), dtype=float, count=len(holes)) * M_TO_MM_FACTOR
+            radii_mm = np.fromiter((hole_obj.shape.get_radius_at(0) if hasattr(hole_obj.shape, 'get_radius_at') else 0.003
+                                    for hole_obj in holes), dtype=float, count=len(holes)) * M_TO_MM_FACTOR
+            is_open = np.fromiter((fingering.is_side_comp_open(hole_obj.label) for hole_obj in holes), dtype=bool, count=len(holes))
+            # Cada agujero es un círculo: EllipseCollection (unidades de datos) dibuja todos los abiertos (contorno)
+            # y todos los cerrados (relleno) como dos artistas, sin teselar cada círculo
+            offsets = np.column_stack((xs_mm, np.zeros_like(xs_mm)))
+            for mask, facecolor in ((is_open, 'none'), (~is_open, 'dimgray')):
+                if mask.any():
+                    ax.add_collection(EllipseCollection(2 * radii_mm[mask], 2 * radii_mm[mask], 0.0, units='xy',
+                                                        offsets=offsets[mask], offset_transform=ax.transData,
+                                                        facecolors=facecolor, edgecolors='dimgray', linewidths=0.5, zorder=2))
+            ax.autoscale_view()
+        except Exception as e_holes:
+            logger.error(f"Error al dibujar los agujeros para {model_name}, nota {note}: {e_holes}")
+
     def plot_top_view_instrument_geometry(self, note: str = "D", ax: Optional[plt.Axes] = None) -> Optional[plt.Axes]:
         fig: plt.Figure
         if ax is None:
@@ -569,42 +924,8 @@ class FluteOperations:
                 logger.error(f"{msg} en {self.flute_data.flute_model}")
                 ax.text(0.5,0.5, msg, ha='center', transform=ax.transAxes)
             else:
-                analysis_obj = self.flute_data.acoustic_analysis[note]
-                instrument_geometry = analysis_obj.get_instrument_geometry()
-                if not instrument_geometry:
-                    msg = f"No hay datos de geometría para nota '{note}'"
-                    logger.error(f"{msg} en {self.flute_data.flute_model}.")
-                    ax.text(0.5,0.5, msg, ha='center', transform=ax.transAxes)
-                else:
-                    # Dibujar el perfil del tubo principal usando combined_measurements
-                    combined_measurements = self.flute_data.combined_measurements
-                    if combined_measurements:
-                        try:
-                            positions_mm = np.array([item["position"] for item in combined_measurements])
-                            diameters_mm = np.array([item["diameter"] for item in combined_measurements])
-                            radii_mm = diameters_mm / 2.0
-                            ax.plot(positions_mm, radii_mm, color='black', linestyle='-', linewidth=1)
-                            ax.plot(positions_mm, -radii_mm, color='black', linestyle='-', linewidth=1)
-                        except Exception as e_plot_bore:
-                            logger.error(f"Error al dibujar el tubo principal usando combined_measurements para {self.flute_data.flute_model}: {e_plot_bore}")
-                            ax.text(0.5, 0.5, "Error al dibujar tubo", ha='center', va='center', transform=ax.transAxes, color='red')
-                    else:
-                        logger.warning(f"No hay mediciones combinadas para {self.flute_data.flute_model} para dibujar el tubo en vista superior.")
-                        ax.text(0.5, 0.5, "Error: Geometría del tubo no disponible", ha='center', va='center', transform=ax.transAxes)
-
-                    try:
-                        holes_details_for_plot = []
-                        fingering = instrument_geometry.fingering_chart.fingering_of(note)
-                        for hole_obj in instrument_geometry.holes:
-                            pos_m = hole_obj.position.get_value()
-                            rad_m = hole_obj.shape.get_radius_at(0) if hasattr(hole_obj.shape, 'get_radius_at') else 0.003 
-                            is_open = fingering.is_side_comp_open(hole_obj.label)
-                            holes_details_for_plot.append({
-                                'label': hole_obj.label, 'position_m': pos_m, 'radius_m': rad_m, 'is_open': is_open
-                            })
-                        FluteOperations._plot_holes_static(holes_details_for_plot, ax, M_TO_MM_FACTOR, default_color='dimgray', linewidth=0.5)
-                    except Exception as e_holes:
-                        logger.error(f"Error al dibujar los agujeros para {self.flute_data.flute_model}, nota {note}: {e_holes}")
+                FluteOperations._draw_top_view(ax, note, self.flute_data.acoustic_analysis[note],
+                                               self._combined_measurements_array(), self.flute_data.flute_model)
 
             ax.set_xlabel("Posición (mm)")
             ax.set_ylabel("Radio (mm)")
@@ -623,9 +944,11 @@ class FluteOperations:
          combined_measurements_list: List[Tuple[List[Dict[str, float]], str]], 
          note: str,
          fig_to_use: Optional[plt.Figure] = None,
-         base_colors: List[str] = BASE_COLORS,
-         linestyles: List[str] = LINESTYLES
+         base_colors: Sequence[str] = BASE_COLORS,
+         linestyles: Sequence[str] = LINESTYLES,
+         use_tight_layout: bool = True
      ) -> plt.Figure :
+     """use_tight_layout=False: en una fig_to_use sin motor de layout usa márgenes fijos en vez de tight_layout (modo batch)."""
 
      fig: plt.Figure
      axes: np.ndarray
@@ -637,7 +960,7 @@ class FluteOperations:
          if not isinstance(axes_array, np.ndarray): axes = np.array([axes_array])
          else: axes = axes_array
      else:
-         fig, axes_array = plt.subplots(4, 1, figsize=(12,18), gridspec_kw={'height_ratios': [2, 1, 1, 1]})
+         fig, axes_array = plt.subplots(4, 1, figsize=(12,18), gridspec_kw={'height_ratios': [2, 1, 1, 1]}, layout='constrained')
          if not isinstance(axes_array, np.ndarray):
              axes = np.array([axes_array])
          else:
@@ -655,6 +978,12 @@ class FluteOperations:
              ax_item.clear()
 
      legend_handles_adm, legend_handles_pres, legend_handles_flow = [], [], []
+     seen_labels_adm: set = set(); seen_labels_pres: set = set(); seen_labels_flow: set = set()
+     # Límites y del panel de admitancia acumulados como escalares; se aplican una sola vez tras el bucle
+     adm_ymin, adm_ymax = np.inf, -np.inf
+     antires_marks: List[Tuple[int, str, Tuple[float, ...]]] = [] # (índice de flauta, color, antirresonancias)
+     # Nombre de flauta -> mediciones combinadas (reversed: ante nombres repetidos gana la primera aparición)
+     cm_map = {cm_name: cm_data for cm_data, cm_name in reversed(combined_measurements_list)}
 
      for index, ((analysis_dict, flute_name_aa), (measurements_data, flute_name_cm)) in enumerate(zip(acoustic_analysis_list, combined_measurements_list)):
          style_idx = index % len(linestyles)
@@ -673,89 +1002,91 @@ class FluteOperations:
 
          frequencies = analysis_obj.frequencies
          impedance = analysis_obj.impedance
-         valid_impedance = np.where(np.abs(impedance) < 1e-12, 1e-12, impedance)
-         admittance_db = 20 * np.log10(np.abs(1.0 / valid_impedance))
-
-         line_adm, = ax_admittance.plot(frequencies, admittance_db, linestyle=linestyle, color=color, label=flute_name, alpha=0.8)
-         if not any(lh.get_label() == flute_name for lh in legend_handles_adm):
-             legend_handles_adm.append(line_adm)
+         admittance_db = _admittance_db(impedance)
 
-         antires_freqs = list(analysis_obj.antiresonance_frequencies())
-         current_ymin_adm, current_ymax_adm = ax_admittance.get_ylim() if ax_admittance.has_data() else (np.min(admittance_db)-5 if admittance_db.size > 0 else -60, np.max(admittance_db)+5 if admittance_db.size > 0 else 0)
-         ax_admittance.set_ylim(min(current_ymin_adm, np.min(admittance_db)-5 if admittance_db.size > 0 else -60),
-                                max(current_ymax_adm, np.max(admittance_db)+5 if admittance_db.size > 0 else 0))
-         ymin_adm, ymax_adm = ax_admittance.get_ylim()
+         # Curvas densas rasterizadas (ejes y textos siguen vectoriales) para aligerar el render y los PDF
+         line_adm, = ax_admittance.plot(frequencies, admittance_db, linestyle=linestyle, color=color, label=flute_name, alpha=0.8, rasterized=True)
+         if flute_name not in seen_labels_adm:
+             seen_labels_adm.add(flute_name); legend_handles_adm.append(line_adm)
 
-         for i_ar, f_ar in enumerate(antires_freqs[:3]):
-             ax_admittance.vlines(f_ar, ymin_adm, ymax_adm, color=color, linestyle=':', alpha=0.6)
-             if i_ar < 2 :
-                 ax_admittance.text(f_ar, ymin_adm + (ymax_adm - ymin_adm) * (0.95 - index*0.08), f"{f_ar:.0f}",
-                                 rotation=90, color=color, fontsize=7, ha='right', va='top', bbox=dict(facecolor='white', alpha=0.5, pad=0.1, edgecolor='none'))
+         antires_freqs = _get_antires(analysis_obj)
+         adm_ymin = min(adm_ymin, np.min(admittance_db)-5 if admittance_db.size > 0 else -60)
+         adm_ymax = max(adm_ymax, np.max(admittance_db)+5 if admittance_db.size > 0 else 0)
+         antires_marks.append((index, color, antires_freqs[:3]))
 
-         x_coords, pressure_modes, flow_modes = analysis_obj.get_pressure_flow()
-         pressure_abs = np.abs(pressure_modes.T)
-         flow_abs = np.abs(flow_modes.T)
+         # pressure_modes/flow_modes: (N_freq, N_x). Solo se toma el módulo de las filas de los modos graficados.
+         x_coords, pressure_modes, flow_modes = _get_pressure_flow(analysis_obj)
 
+         # Índices de frecuencia de los modos graficados, en una sola búsqueda (frequencies es monótona)
+         mode_indices = _nearest_indices(np.asarray(frequencies, dtype=float), np.asarray(antires_freqs[:2], dtype=float))
          for i_mode, f_mode in enumerate(antires_freqs[:2]): 
-             if pressure_abs.shape[1] > 0 and flow_abs.shape[1] > 0:
-                 idx_f_mode = np.argmin(np.abs(frequencies - f_mode))
-                 if idx_f_mode < pressure_abs.shape[1]: 
+             if pressure_modes.shape[0] > 0 and flow_modes.shape[0] > 0:
+                 idx_f_mode = int(mode_indices[i_mode])
+                 if idx_f_mode < pressure_modes.shape[0]: 
                      mode_linestyle = linestyle if i_mode == 0 else '--' 
                      mode_alpha = 0.8 if i_mode == 0 else 0.6
-                     line_pres, = ax_pressure.plot(x_coords, pressure_abs[:, idx_f_mode], 
+                     mode_label = f"{flute_name} (AR{i_mode+1}: {f_mode:.0f}Hz)" # Misma etiqueta para presión y flujo
+                     line_pres, = ax_pressure.plot(x_coords, np.abs(pressure_modes[idx_f_mode, :]), 
                                                   linestyle=mode_linestyle, color=color,
-                                                  label=f"{flute_name} (AR{i_mode+1}: {f_mode:.0f}Hz)", alpha=mode_alpha)
-                     if not any(lh.get_label() == line_pres.get_label() for lh in legend_handles_pres):
-                         legend_handles_pres.append(line_pres)
-                     line_flow, = ax_flow.plot(x_coords, flow_abs[:, idx_f_mode], 
+                                                  label=mode_label, alpha=mode_alpha, rasterized=True)
+                     if mode_label not in seen_labels_pres:
+                         seen_labels_pres.add(mode_label); legend_handles_pres.append(line_pres)
+                     line_flow, = ax_flow.plot(x_coords, np.abs(flow_modes[idx_f_mode, :]), 
                                                   linestyle=mode_linestyle, color=color,
-                                                  label=f"{flute_name} (AR{i_mode+1}: {f_mode:.0f}Hz)", alpha=mode_alpha)
-                     if not any(lh.get_label() == line_flow.get_label() for lh in legend_handles_flow):
-                         legend_handles_flow.append(line_flow)
+                                                  label=mode_label, alpha=mode_alpha, rasterized=True)
+                     if mode_label not in seen_labels_flow:
+                         seen_labels_flow.add(mode_label); legend_handles_flow.append(line_flow)
          else:
              logger.debug(f"No hay frecuencias antiresonantes o datos de modo para {flute_name}, nota {note}.")
 
          if ax_geometry:
              try:
-                 class MinimalFluteDataForTopView:
-                     def __init__(self, acoustic_analysis_data_for_note, model_name, combined_measurements_data):
-                         self.acoustic_analysis = acoustic_analysis_data_for_note
-                         self.flute_model = model_name
-                         self.combined_measurements = combined_measurements_data
-                         self.data = {"Flute Model": model_name}
-                 current_flute_measurements = []
-                 for cm_data, cm_name in combined_measurements_list:
-                     if cm_name == flute_name:
-                         current_flute_measurements = cm_data; break
-                 temp_flute_data_for_top_view = MinimalFluteDataForTopView({note: analysis_obj}, flute_name, current_flute_measurements)
-                 temp_flute_ops_for_top_view = FluteOperations(temp_flute_data_for_top_view)
-                 returned_ax = temp_flute_ops_for_top_view.plot_top_view_instrument_geometry(note=note, ax=ax_geometry)
-                 if returned_ax is None:
-                     logger.error(f"Plotting top view geometry falló y devolvió None para {flute_name}, nota {note}")
-                 elif returned_ax is not ax_geometry and returned_ax is not None : 
-                      logger.warning("plot_top_view_instrument_geometry podría haber creado un nuevo eje inesperadamente. Cerrando figura extra.")
-                      plt.close(returned_ax.figure) 
+                 current_flute_measurements = cm_map.get(flute_name, [])
+                 ax_geometry.clear()
+                 ax_geometry.set_aspect('equal', adjustable='datalim')
+                 FluteOperations._draw_top_view(ax_geometry, note, analysis_obj,
+                                                FluteOperations._measurements_to_array(current_flute_measurements), flute_name)
              except Exception as e_geom_top_view:
                  logger.error(f"Error al graficar la vista superior de la geometría para {flute_name}, nota {note}: {e_geom_top_view}")
                  if ax_geometry: 
                      ax_geometry.clear() 
                      ax_geometry.text(0.5,0.5, f"Error geom. sup. {flute_name}", ha='center', va='center', transform=ax_geometry.transAxes, color='red')
 
+     # Segunda pasada: marcadores de antirresonancia con los límites y definitivos
+     if antires_marks:
+         ax_admittance.set_ylim(adm_ymin, adm_ymax)
+         label_bbox = dict(facecolor='white', alpha=0.5, pad=0.1, edgecolor='none') # Compartido por todas las etiquetas
+         for index, color, antires_freqs in antires_marks:
+             if not antires_freqs: continue
+             # Todas las antirresonancias de la flauta en un solo vlines (una LineCollection)
+             ax_admittance.vlines(antires_freqs, adm_ymin, adm_ymax, color=color, linestyle=':', alpha=0.6)
+             label_y = adm_ymin + (adm_ymax - adm_ymin) * (0.95 - index*0.08)
+             for f_ar in antires_freqs[:2]:
+                 ax_admittance.text(f_ar, label_y, f"{f_ar:.0f}",
+                                    rotation=90, color=color, fontsize=7, ha='right', va='top', bbox=label_bbox)
+
      if ax_admittance:
          ax_admittance.set_title(f"Admitancia para {note}", fontsize=10); ax_admittance.set_xlabel("Frecuencia (Hz)")
-         ax_admittance.set_ylabel("Admitancia (dB)"); ax_admittance.legend(handles=legend_handles_adm, loc='best', fontsize=8); ax_admittance.grid(True, linestyle=':', alpha=0.7)
+         ax_admittance.set_ylabel("Admitancia (dB)"); ax_admittance.grid(True, linestyle=':', alpha=0.7)
+         # Leyendas solo si hay entradas (evita construir leyendas vacías)
+         if legend_handles_adm: ax_admittance.legend(handles=legend_handles_adm, loc='best', fontsize=8)
      if ax_pressure:
          ax_pressure.set_title(f"Presión vs Posición ({note})", fontsize=10); ax_pressure.set_xlabel("Posición (m)")
-         ax_pressure.set_ylabel("Presión (Pa)"); ax_pressure.legend(handles=legend_handles_pres, loc='best', fontsize=8); ax_pressure.grid(True, linestyle=':', alpha=0.7)
+         ax_pressure.set_ylabel("Presión (Pa)"); ax_pressure.grid(True, linestyle=':', alpha=0.7)
+         if legend_handles_pres: ax_pressure.legend(handles=legend_handles_pres, loc='best', fontsize=8)
      if ax_geometry: 
          ax_geometry.set_title(f"Geometría (Vista Sup.) para {note}", fontsize=10); ax_geometry.set_xlabel("Posición (mm)") # Título general
          ax_geometry.set_ylabel("Radio (mm)"); ax_geometry.grid(True, linestyle=':', alpha=0.7)
      if ax_flow:
          ax_flow.set_title(f"Flujo vs Posición ({note})", fontsize=10); ax_flow.set_xlabel("Posición (m)")
-         ax_flow.set_ylabel("Flujo (m³/s)"); ax_flow.legend(handles=legend_handles_flow, loc='best', fontsize=8); ax_flow.grid(True, linestyle=':', alpha=0.7)
+         ax_flow.set_ylabel("Flujo (m³/s)"); ax_flow.grid(True, linestyle=':', alpha=0.7)
+         if legend_handles_flow: ax_flow.legend(handles=legend_handles_flow, loc='best', fontsize=8)
 
      try:
-         fig.tight_layout(rect=[0,0,1,0.97])
+         # Figura recibida sin motor de layout: tight_layout como antes (o márgenes fijos en batch); la creada aquí ya es 'constrained'
+         if fig.get_layout_engine() is None:
+             if use_tight_layout: fig.tight_layout(rect=[0,0,1,0.97])
+             else: fig.subplots_adjust(top=0.97, bottom=0.05, left=0.08, right=0.98, hspace=0.35)
      except Exception as e_layout:
          logger.debug(f"Error en tight_layout para individual_admittance_analysis: {e_layout}")
      return fig
@@ -764,33 +1095,50 @@ class FluteOperations:
     def plot_combined_admittance(
             acoustic_analysis_list: List[Tuple[Dict[str, ImpedanceComputation], str]],
             ax: Optional[plt.Axes] = None,
-            base_colors: List[str] = BASE_COLORS,
-            linestyles: List[str] = LINESTYLES
+            base_colors: Sequence[str] = BASE_COLORS,
+            linestyles: Sequence[str] = LINESTYLES
         ) -> plt.Figure:
 
         fig: plt.Figure
-        if ax is None: fig, ax = plt.subplots(figsize=(14, 8))
-        else: fig = ax.figure; ax.clear()
-
-        for index, (analysis_dict, flute_name) in enumerate(acoustic_analysis_list):
-            linestyle = linestyles[index % len(linestyles)]
-            color = base_colors[index % len(base_colors)]
-
-            line_plotted_for_legend = False
-            for note, analysis_obj in analysis_dict.items():
-                if isinstance(analysis_obj, ImpedanceComputation):
-                    frequencies = analysis_obj.frequencies
-                    impedance = analysis_obj.impedance
-                    valid_impedance = np.where(np.abs(impedance) < 1e-12, 1e-12, impedance)
-                    admittance_db = 20 * np.log10(np.abs(1.0 / valid_impedance))
-
-                    current_label = flute_name if not line_plotted_for_legend else "_nolegend_"
-                    ax.plot(frequencies, admittance_db, linestyle=linestyle, color=color, label=current_label, alpha=0.6)
-                    if not line_plotted_for_legend: line_plotted_for_legend = True
-
-        handles, labels = ax.get_legend_handles_labels()
-        unique_handles_labels = dict(zip(labels, handles))
-        ax.legend(unique_handles_labels.values(), unique_handles_labels.keys(), loc='best', fontsize=9)
+        ax_provided = ax is not None
+        if ax is None: fig, ax = plt.subplots(figsize=(14, 8), layout='constrained')
+        else: fig = ax.figure
+
+        # (índice de flauta, análisis de sus notas) de cada flauta con curvas, en orden de dibujo
+        flute_curves = [(index, [obj for obj in analysis_dict.values() if isinstance(obj, ImpedanceComputation)])
+                        for index, (analysis_dict, _) in enumerate(acoustic_analysis_list)]
+        flute_curves = [(index, objs) for index, objs in flute_curves if objs]
+        # Referencias débiles: iguales solo si apuntan al mismo análisis vivo (un id() reciclado no coincide)
+        curves_key = tuple((index, tuple(weakref.ref(obj) for obj in objs)) for index, objs in flute_curves)
+
+        # Mismos análisis sobre el mismo eje: solo se actualiza el estilo de las colecciones existentes
+        cached = _COMBINED_ADMITTANCE_ARTISTS.get(ax) if ax_provided else None
+        if cached is not None and cached[0] == curves_key and all(coll in ax.collections for coll in cached[1]):
+            collections = cached[1]
+        else:
+            if ax_provided: ax.clear()
+            collections = []
+            for _, objs in flute_curves:
+                # Todas las notas de una flauta en una sola LineCollection (un artista por flauta, no por nota)
+                segments = []
+                for analysis_obj in objs:
+                    # Diezmado antes de calcular la admitancia: solo se procesan los puntos que se dibujan (datos originales intactos)
+                    keep = _admittance_plot_indices(analysis_obj)
+                    segments.append(np.column_stack((analysis_obj.frequencies[keep], _admittance_db(analysis_obj.impedance[keep]))))
+                collections.append(ax.add_collection(LineCollection(segments, alpha=0.6, rasterized=True)))
+            ax.autoscale_view()
+            if ax_provided: _COMBINED_ADMITTANCE_ARTISTS[ax] = (curves_key, collections)
+
+        # Leyenda armada durante el recorrido (nombre -> colección de la flauta), sin volver a recorrer los artistas
+        legend_map: Dict[str, Any] = {}
+        for (index, _), coll in zip(flute_curves, collections):
+            flute_name = acoustic_analysis_list[index][1]
+            coll.set_linestyle(linestyles[index % len(linestyles)])
+            coll.set_color(base_colors[index % len(base_colors)])
+            coll.set_label(flute_name)
+            legend_map.setdefault(flute_name, coll)
+
+        if legend_map: ax.legend(legend_map.values(), legend_map.keys(), loc='best', fontsize=9)
 
         ax.set_title("Admitancia Combinada (Todas las Notas, Superpuestas por Flauta)", fontsize=10)
         ax.set_xlabel("Frecuencia (Hz)"); ax.set_ylabel("Admitancia (dB)"); ax.grid(True, linestyle=':', alpha=0.7)
@@ -801,43 +1149,53 @@ class FluteOperations:
             acoustic_analysis_list: List[Tuple[Dict[str, ImpedanceComputation], str]],
             notes_ordered: List[str],
             ax: Optional[plt.Axes] = None,
-            base_colors: List[str] = BASE_COLORS
+            base_colors: Sequence[str] = BASE_COLORS
         ) -> plt.Figure:
 
         fig: plt.Figure
-        if ax is None: fig, ax = plt.subplots(figsize=(14, 8))
+        if ax is None: fig, ax = plt.subplots(figsize=(14, 8), layout='constrained')
         else: fig = ax.figure; ax.clear()
 
         num_flutes = len(acoustic_analysis_list)
         total_width_for_note = 0.7
         offsets = np.linspace(-total_width_for_note / 2, total_width_for_note / 2, num_flutes if num_flutes > 0 else 1) if num_flutes > 1 else [0]
 
+        # Colores resueltos una vez por flauta, fuera del bucle de notas
+        colors = [base_colors[i % len(base_colors)] for i in range(num_flutes)]
+        label_bbox = dict(facecolor='white', alpha=0.3, pad=0.1, edgecolor='none')
         legend_handles = []
+        legend_labels: List[str] = []
+        seen_labels: set = set()
 
         for index, (analysis_dict, flute_name) in enumerate(acoustic_analysis_list):
-            color = base_colors[index % len(base_colors)]
+            color = colors[index]
+            x_offset = offsets[index]
+            # Puntos de la flauta acumulados y dibujados con un único scatter
+            xs: List[float] = []
+            ys: List[float] = []
 
             for note_idx, note in enumerate(notes_ordered):
                 analysis_obj = analysis_dict.get(note)
                 if isinstance(analysis_obj, ImpedanceComputation):
-                    antires_freqs = list(analysis_obj.antiresonance_frequencies())
+                    antires_freqs = _get_antires(analysis_obj)
                     if antires_freqs:
-                        for i_ar, f_ar in enumerate(antires_freqs[:2]): 
-                            x_pos = note_idx + offsets[index]
-                            ax.plot(x_pos, f_ar, "o", color=color, markersize=6, alpha=0.7)
-                            if i_ar < 2:
-                                 ax.text(x_pos, f_ar + (10 * (-1)**i_ar), f"{f_ar:.0f}", fontsize=7,
-                                         ha="center", va="bottom" if i_ar % 2 == 0 else "top", color=color,
-                                         bbox=dict(facecolor='white', alpha=0.3, pad=0.1, edgecolor='none'))
-            if not any(lh.get_label() == flute_name for lh in legend_handles):
-                legend_handles.append(plt.Line2D([0], [0], marker='o', color=color, linestyle='None', label=flute_name, markersize=6))
+                        x_pos = note_idx + x_offset
+                        for i_ar, f_ar in enumerate(antires_freqs[:2]):
+                            xs.append(x_pos); ys.append(f_ar)
+                            ax.text(x_pos, f_ar + (10 * (-1)**i_ar), f"{f_ar:.0f}", fontsize=7,
+                                    ha="center", va="bottom" if i_ar % 2 == 0 else "top", color=color,
+                                    bbox=label_bbox)
+            if xs:
+                ax.scatter(xs, ys, color=color, s=36, alpha=0.7) # s=36 equivale a markersize=6
+            if flute_name not in seen_labels:
+                seen_labels.add(flute_name); legend_handles.append(_marker_legend_proxy(color)); legend_labels.append(flute_name)
 
         ax.set_xticks(range(len(notes_ordered)))
         ax.set_xticklabels(notes_ordered, rotation=45, ha="right")
-        ax.legend(handles=legend_handles, loc='best', fontsize=9)
+        if legend_handles: ax.legend(legend_handles, legend_labels, loc='best', fontsize=9)
         ax.set_title("Frecuencias Antiresonantes (Primeras 2) vs. Nota", fontsize=10)
         ax.set_xlabel("Nota"); ax.set_ylabel("Frecuencia (Hz)"); ax.grid(True, axis='y', linestyle=':', alpha=0.7)
-        fig.tight_layout()
+        _finish_layout(fig)
         return fig
 
     @staticmethod
@@ -845,36 +1203,33 @@ class FluteOperations:
             acoustic_analysis_list: List[Tuple[Dict[str, ImpedanceComputation], str]],
             notes_ordered: List[str],
             ax: Optional[plt.Axes] = None,
-            base_colors: List[str] = BASE_COLORS,
-            linestyles: List[str] = LINESTYLES
+            base_colors: Sequence[str] = BASE_COLORS,
+            linestyles: Sequence[str] = LINESTYLES,
+            antires_cache: Optional[np.ndarray] = None
         ) -> plt.Figure:
+        """antires_cache: resultado de _collect_antires para los mismos argumentos (evita recorrer los análisis)."""
 
         fig: plt.Figure
-        if ax is None: fig, ax = plt.subplots(figsize=(14, 8))
+        if ax is None: fig, ax = plt.subplots(figsize=(14, 8), layout='constrained')
         else: fig = ax.figure; ax.clear()
 
         num_flutes = len(acoustic_analysis_list)
         offset_per_flute = 0.12
         base_x_positions = np.arange(len(notes_ordered))
+        antires = antires_cache if antires_cache is not None else _collect_antires(acoustic_analysis_list, notes_ordered)
  
         legend_handles = [] 
+        seen_labels: set = set()
         for index, (analysis_dict, flute_name) in enumerate(acoustic_analysis_list):
             linestyle = linestyles[index % len(linestyles)]
             color = base_colors[index % len(base_colors)]
-            cents_diffs = []
             current_x_offset = 0.0 # No offset entre flautas
-            for note in notes_ordered:
-                note_cents = np.nan
-                analysis_obj = analysis_dict.get(note)
-                if isinstance(analysis_obj, ImpedanceComputation):
-                    antires_freqs = list(analysis_obj.antiresonance_frequencies())
-                    if len(antires_freqs) >= 2:
-                        f1, f2 = antires_freqs[0], antires_freqs[1]
-                        if f1 > 0 and f2 > 0: note_cents = 1200 * np.log2(f2 / (2.0 * f1))
-                cents_diffs.append(note_cents)
+            f1, f2 = antires[index, :, 0], antires[index, :, 1]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                cents_diffs = _cents_kernel(f1, f2)
             line, = ax.plot(base_x_positions + current_x_offset, cents_diffs, marker="o", linestyle=linestyle, color=color, label=flute_name, markersize=5, alpha=0.8)
-            if not any(lh.get_label() == flute_name for lh in legend_handles):
-                legend_handles.append(line)
+            if flute_name not in seen_labels:
+                seen_labels.add(flute_name); legend_handles.append(line)
 
         if legend_handles: ax.legend(handles=legend_handles, loc='best', fontsize=9)
         ax.set_xticks(base_x_positions)
@@ -882,7 +1237,7 @@ class FluteOperations:
         ax.axhline(0, color='grey', linestyle='--', lw=0.8)
         ax.set_title("Inharmonicidad (Cents: Pico 2 vs 2 * Pico 1)", fontsize=10)
         ax.set_xlabel("Nota"); ax.set_ylabel("Diferencia (cents)"); ax.grid(True, linestyle=':', alpha=0.7)
-        fig.tight_layout()
+        _finish_layout(fig)
         return fig
 
     @staticmethod
@@ -898,7 +1253,7 @@ class FluteOperations:
         para una sola flauta.
         """
         fig: plt.Figure
-        if ax is None: fig, ax = plt.subplots(figsize=(10, 6))
+        if ax is None: fig, ax = plt.subplots(figsize=(10, 6), layout='constrained')
         else: fig = ax.figure; ax.clear()
 
         base_x_positions = np.arange(len(notes_ordered))
@@ -917,7 +1272,7 @@ class FluteOperations:
 
                 if isinstance(analysis_obj, ImpedanceComputation):
                     logger.debug(f"    Nota '{note_log}' ({label_for_log}): Es ImpedanceComputation.")
-                    antires_freqs = list(analysis_obj.antiresonance_frequencies())
+                    antires_freqs = _get_antires(analysis_obj)
                     logger.debug(f"    Nota '{note_log}' ({label_for_log}): Antirresonancias: {antires_freqs[:3]}")
                     if len(antires_freqs) >= 2:
                         f1, f2 = antires_freqs[0], antires_freqs[1]
@@ -947,107 +1302,114 @@ class FluteOperations:
         ax.set_xlabel("Nota"); ax.set_ylabel("Diferencia (cents)"); ax.grid(True, linestyle=':', alpha=0.7); 
         if any(not np.isnan(c) for c in cents_diffs_initial) or any(not np.isnan(c) for c in cents_diffs_optimized):
             ax.legend(loc='best', fontsize=9)
-        fig.tight_layout(); return fig
+        _finish_layout(fig)
+        return fig
 
     @staticmethod
-    def plot_moc_summary(
+    def _compute_note_metrics(
             acoustic_analysis_list: List[Tuple[Dict[str, ImpedanceComputation], str]],
             finger_frequencies_map: Dict[str, Dict[str, float]],
             notes_ordered: List[str],
-            ax: Optional[plt.Axes] = None,
-            base_colors: List[str] = BASE_COLORS,
-            linestyles: List[str] = LINESTYLES
-        ) -> plt.Figure:
-
-        fig: plt.Figure
-        if ax is None: fig, ax = plt.subplots(figsize=(12, 7))
-        else: fig = ax.figure; ax.clear()
+            antires_cache: Optional[np.ndarray] = None
+        ) -> Dict[str, np.ndarray]:
+        """
+        Calcula de una vez las métricas por nota de todas las flautas.
+        Devuelve {'cents_dev', 'moc', 'bi', 'espe'}, cada uno un ndarray (n_flautas, n_notas)
+        con las filas en el orden de acoustic_analysis_list y NaN donde no hay datos, más 'antires'
+        (n_flautas, n_notas, 2), para que todos los resúmenes salgan de un único recorrido de los análisis.
+        antires_cache: resultado de _collect_antires para los mismos argumentos (evita recorrer los análisis).
+        """
+        shape = (len(acoustic_analysis_list), len(notes_ordered))
+        metrics = {key: np.full(shape, np.nan) for key in ("cents_dev", "moc", "bi", "espe")}
+        antires = antires_cache if antires_cache is not None else _collect_antires(acoustic_analysis_list, notes_ordered)
+        for index, (analysis_dict, flute_name) in enumerate(acoustic_analysis_list):
+            current_finger_freqs = finger_frequencies_map.get(flute_name, {})
+            f0, f1 = antires[index, :, 0], antires[index, :, 1]
+            # Notas ausentes, None o 0 -> NaN (las máscaras de los kernels las descartan)
+            f_play = np.fromiter((current_finger_freqs.get(note) or np.nan for note in notes_ordered), dtype=float, count=len(notes_ordered))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                metrics["cents_dev"][index] = _cents_kernel(f0, f1)
+                metrics["moc"][index] = _moc_kernel(f0, f1, f_play)
+                metrics["bi"][index], metrics["espe"][index] = _bi_espe_kernel(f0, f1, f_play, SPEED_OF_SOUND_20C)
+        metrics["antires"] = antires
+        return metrics
 
-        num_flutes = len(acoustic_analysis_list)
-        offset_per_flute = 0.12
+    @staticmethod
+    def _draw_moc_into(
+            ax: plt.Axes,
+            acoustic_analysis_list: List[Tuple[Dict[str, ImpedanceComputation], str]],
+            notes_ordered: List[str],
+            metrics: Dict[str, np.ndarray],
+            base_colors: Sequence[str] = BASE_COLORS,
+            linestyles: Sequence[str] = LINESTYLES
+        ) -> None:
+        """Dibuja el resumen MOC en ax (vacío) a partir de las métricas de _compute_note_metrics."""
         base_x_positions = np.arange(len(notes_ordered))
- 
+
         legend_handles = [] 
+        seen_labels: set = set()
         for index, (analysis_dict, flute_name) in enumerate(acoustic_analysis_list):
             linestyle = linestyles[index % len(linestyles)]
             color = base_colors[index % len(base_colors)]
-            moc_vals = []
-            current_finger_freqs = finger_frequencies_map.get(flute_name, {})
             current_x_offset = 0.0 # No offset entre flautas
-            for note in notes_ordered:
-                moc = np.nan
-                f_play = current_finger_freqs.get(note)
-                analysis_obj = analysis_dict.get(note)
-                if isinstance(analysis_obj, ImpedanceComputation) and f_play is not None and f_play > 0 :
-                    antires = list(analysis_obj.antiresonance_frequencies())
-                    if len(antires) >= 2:
-                        f0, f1 = antires[0], antires[1]
-                        if f0 > 0 and f1 > 0 and f_play > 0 and f0 != f_play and (2.0 * f_play) != 0 and f1 != (2.0*f_play) :
-                            num_term = (1.0 / f1) - (1.0 / (2.0 * f_play))
-                            den_term = (1.0 / f0) - (1.0 / f_play)
-                            if abs(den_term) > 1e-9: 
-                                moc = num_term / den_term
-                moc_vals.append(moc)
+            moc_vals = metrics["moc"][index]
             line, = ax.plot(base_x_positions + current_x_offset, moc_vals, marker="o", linestyle=linestyle, color=color, label=flute_name, markersize=5, alpha=0.8)
-            if not any(lh.get_label() == flute_name for lh in legend_handles):
-                legend_handles.append(line)
+            if flute_name not in seen_labels:
+                seen_labels.add(flute_name); legend_handles.append(line)
 
         if legend_handles: ax.legend(handles=legend_handles, loc='best', fontsize=9)
         ax.set_xticks(base_x_positions)
         ax.set_xticklabels(notes_ordered, rotation=45, ha="right")
         ax.set_xlabel("Nota"); ax.set_ylabel("MOC (ratio)"); ax.set_title("Resumen de MOC por Nota", fontsize=10); ax.grid(True, linestyle=':', alpha=0.7)
-        fig.tight_layout()
-        return fig
 
     @staticmethod
-    def plot_bi_espe_summary(
+    def plot_moc_summary(
             acoustic_analysis_list: List[Tuple[Dict[str, ImpedanceComputation], str]],
             finger_frequencies_map: Dict[str, Dict[str, float]],
             notes_ordered: List[str],
             ax: Optional[plt.Axes] = None,
-            base_colors: List[str] = BASE_COLORS
+            base_colors: Sequence[str] = BASE_COLORS,
+            linestyles: Sequence[str] = LINESTYLES,
+            precomputed: Optional[Dict[str, np.ndarray]] = None
         ) -> plt.Figure:
+        """precomputed: resultado de _compute_note_metrics para los mismos argumentos (evita recalcular)."""
 
         fig: plt.Figure
-        if ax is None: fig, ax = plt.subplots(figsize=(12, 7))
+        if ax is None: fig, ax = _new_agg_figure(figsize=(12, 7))
         else: fig = ax.figure; ax.clear()
 
+        metrics = precomputed if precomputed is not None else \
+            FluteOperations._compute_note_metrics(acoustic_analysis_list, finger_frequencies_map, notes_ordered)
+        FluteOperations._draw_moc_into(ax, acoustic_analysis_list, notes_ordered, metrics, base_colors, linestyles)
+        _finish_layout(fig)
+        return fig
+
+    @staticmethod
+    def _draw_bi_espe_into(
+            ax: plt.Axes,
+            acoustic_analysis_list: List[Tuple[Dict[str, ImpedanceComputation], str]],
+            notes_ordered: List[str],
+            metrics: Dict[str, np.ndarray],
+            base_colors: Sequence[str] = BASE_COLORS
+        ) -> None:
+        """Dibuja el resumen B_I/ESPE en ax (vacío) a partir de las métricas de _compute_note_metrics."""
         num_flutes = len(acoustic_analysis_list)
         base_x_positions = np.arange(len(notes_ordered))
         # total_width_per_flute_group ahora se usa para separar BI de ESPE para la misma flauta
         width_for_bi_espe_separation = 0.15 # Ancho para separar BI y ESPE de la misma flauta
 
-        def get_speed_of_sound(temp_celsius=20.0): return 331.3 * np.sqrt(1 + temp_celsius / 273.15)
-        speed_of_sound_ref = get_speed_of_sound(20.0)
         legend_items = {} 
 
         for idx, (analysis_dict, flute_name) in enumerate(acoustic_analysis_list):
             color = base_colors[idx % len(base_colors)]
-            bi_vals, espe_vals = [], []
-            current_finger_freqs = finger_frequencies_map.get(flute_name, {})
-            for note in notes_ordered:
-                bi, espe = np.nan, np.nan
-                f_play_I = current_finger_freqs.get(note)
-                analysis_obj = analysis_dict.get(note)
-                if isinstance(analysis_obj, ImpedanceComputation) and f_play_I is not None and f_play_I > 0:
-                    antires = list(analysis_obj.antiresonance_frequencies())
-                    if len(antires) >= 2:
-                        f0, f1 = antires[0], antires[1]
-                        f_play_II = 2.0 * f_play_I
-                        if f0 > 0: bi = 1200.0 * np.log2(f_play_I / f0)
-                        delta_l_I = (speed_of_sound_ref / 2.0) * ((1.0 / f_play_I) - (1.0 / f0)) if f0 > 0 else 0.0
-                        delta_l_II = speed_of_sound_ref * ((1.0 / f_play_II) - (1.0 / f1)) if f1 > 0 and f_play_II > 0 else 0.0
-                        delta_delta_l = delta_l_II - delta_l_I
-                        L_eff_I = (speed_of_sound_ref / (2.0 * f_play_I))
-                        if L_eff_I > 0 and (L_eff_I + delta_delta_l) > 1e-9: 
-                            espe = 1200.0 * np.log2(L_eff_I / (L_eff_I + delta_delta_l))
-                bi_vals.append(bi); espe_vals.append(espe)
+            bi_vals, espe_vals = metrics["bi"][idx], metrics["espe"][idx]
             # group_center_offset es 0 para alinear todas las flautas
             # Se mantiene una pequeña separación entre BI y ESPE para la misma flauta
-            line_bi, = ax.plot(base_x_positions - width_for_bi_espe_separation / 2, bi_vals,
-                    linestyle='-', color=color, marker='o', markersize=5, alpha=0.8)
-            line_espe, = ax.plot(base_x_positions + width_for_bi_espe_separation / 2, espe_vals,
-                    linestyle='--', dashes=(4,2), color=color, marker='x', markersize=5, alpha=0.8) 
+            # B_I (continua, 'o') y ESPE (discontinua, 'x') en una sola llamada a plot
+            line_bi, line_espe = ax.plot(base_x_positions - width_for_bi_espe_separation / 2, bi_vals, '-o',
+                                         base_x_positions + width_for_bi_espe_separation / 2, espe_vals, '--x',
+                                         color=color, markersize=5, alpha=0.8)
+            line_espe.set_dashes((4, 2))
             if f"{flute_name} - $B_I$" not in legend_items:
                 legend_items[f"{flute_name} - $B_I$"] = line_bi
             if f"{flute_name} - ESPE" not in legend_items:
@@ -1060,7 +1422,26 @@ class FluteOperations:
         ax.set_xticklabels(notes_ordered, rotation=45, ha="right")
         ax.axhline(0, color='grey', linestyle='--', lw=0.8) 
         ax.set_title("$B_I$ y ESPE a Través de las Notas", fontsize=10); ax.set_xlabel("Nota"); ax.set_ylabel("Cents"); ax.grid(True, linestyle=':', alpha=0.7)
-        fig.tight_layout()
+
+    @staticmethod
+    def plot_bi_espe_summary(
+            acoustic_analysis_list: List[Tuple[Dict[str, ImpedanceComputation], str]],
+            finger_frequencies_map: Dict[str, Dict[str, float]],
+            notes_ordered: List[str],
+            ax: Optional[plt.Axes] = None,
+            base_colors: Sequence[str] = BASE_COLORS,
+            precomputed: Optional[Dict[str, np.ndarray]] = None
+        ) -> plt.Figure:
+        """precomputed: resultado de _compute_note_metrics para los mismos argumentos (evita recalcular)."""
+
+        fig: plt.Figure
+        if ax is None: fig, ax = _new_agg_figure(figsize=(12, 7))
+        else: fig = ax.figure; ax.clear()
+
+        metrics = precomputed if precomputed is not None else \
+            FluteOperations._compute_note_metrics(acoustic_analysis_list, finger_frequencies_map, notes_ordered)
+        FluteOperations._draw_bi_espe_into(ax, acoustic_analysis_list, notes_ordered, metrics, base_colors)
+        _finish_layout(fig)
         return fig
 
     @staticmethod
@@ -1070,14 +1451,56 @@ class FluteOperations:
             finger_frequencies_map: Dict[str, Dict[str, float]],
             notes_ordered: List[str],
         ) -> str:
-        with PdfPages(pdf_filename) as pdf:
-            logger.info(f"Generando gráfico MOC para PDF: {pdf_filename}")
-            fig_moc = FluteOperations.plot_moc_summary(acoustic_analysis_list, finger_frequencies_map, notes_ordered)
-            pdf.savefig(fig_moc); plt.close(fig_moc)
+        # Backend PDF importado aquí: solo se carga cuando realmente se genera un reporte
+        from matplotlib.backends.backend_pdf import PdfPages
+
+        # Tupla: orden de notas inmutable para todo el reporte (y hashable para la clave de caché)
+        notes_ordered = tuple(notes_ordered)
+        # Antirresonancias y métricas por nota (incluida la búsqueda de frecuencias de digitación)
+        # calculadas una sola vez y compartidas por ambos gráficos
+        metrics = FluteOperations._compute_note_metrics(acoustic_analysis_list, finger_frequencies_map, notes_ordered)
+        cache_key = _summary_pdf_key(metrics, [name for _, name in acoustic_analysis_list], notes_ordered)
+        # Se escribe en un temporal junto al destino y se publica con os.replace (atómico):
+        # nunca queda un PDF a medio escribir en pdf_filename.
+        tmp_filename = pdf_filename + ".part"
+
+        cached_pdf = _SUMMARY_PDF_CACHE.get(cache_key)
+        if cached_pdf is not None:
+            logger.info("Reporte PDF de resumen sin cambios, reutilizando el generado previamente: %s", pdf_filename)
+            _SUMMARY_PDF_CACHE.move_to_end(cache_key)
+            try:
+                with open(tmp_filename, "wb") as tmp_file: tmp_file.write(cached_pdf)
+                os.replace(tmp_filename, pdf_filename)
+            except Exception:
+                if os.path.exists(tmp_filename): os.remove(tmp_filename)
+                raise
+            return pdf_filename
+
+        # Una sola figura (sin pyplot, fuera de Gcf) para ambas páginas: se limpia entre una y otra.
+        # Los gráficos se dibujan justo antes de cada savefig, que es donde ocurre el render.
+        fig, ax = _new_agg_figure(figsize=(12, 7))
+        # bbox_inches=None: la figura usa layout 'constrained', se evita el segundo render de 'tight'.
+        # PdfPages mantiene un único PdfFile para todas las páginas: las fuentes se incrustan una sola vez al cerrar.
+        try:
+            with matplotlib.rc_context({"pdf.compression": 6, "path.simplify_threshold": 1.0}):
+                with PdfPages(tmp_filename) as pdf:
+                    logger.info("Generando gráfico MOC para PDF: %s", pdf_filename)
+                    FluteOperations._draw_moc_into(ax, acoustic_analysis_list, notes_ordered, metrics)
+                    pdf.savefig(fig, bbox_inches=None)
+                    fig.clf(); ax = fig.add_subplot()
+                    logger.info("Generando gráfico B_I/ESPE para PDF: %s", pdf_filename)
+                    FluteOperations._draw_bi_espe_into(ax, acoustic_analysis_list, notes_ordered, metrics)
+                    pdf.savefig(fig, bbox_inches=None)
+            with open(tmp_filename, "rb") as tmp_file: pdf_bytes = tmp_file.read()
+            os.replace(tmp_filename, pdf_filename)
+        except Exception:
+            if os.path.exists(tmp_filename): os.remove(tmp_filename)
+            raise
+        finally:
+            fig.clear()
 
-            logger.info(f"Generando gráfico B_I/ESPE para PDF: {pdf_filename}")
-            fig_bi_espe = FluteOperations.plot_bi_espe_summary(acoustic_analysis_list, finger_frequencies_map, notes_ordered)
-            pdf.savefig(fig_bi_espe); plt.close(fig_bi_espe)
+        _SUMMARY_PDF_CACHE[cache_key] = pdf_bytes
+        if len(_SUMMARY_PDF_CACHE) > _SUMMARY_PDF_CACHE_SIZE: _SUMMARY_PDF_CACHE.popitem(last=False)
 
-        logger.info(f"Reporte PDF de resumen guardado en: {pdf_filename}")
+        logger.info("Reporte PDF de resumen guardado en: %s", pdf_filename)
         return pdf_filename
@@ -611,7 +611,7 @@ class App(tk.Tk):
                 ax_part = axes_flat[part_idx]
                 adjusted_positions, diameters = flute_ops_instance._calculate_adjusted_positions(part_name, 0.0)
 
-                if not adjusted_positions or not diameters: continue
+                if adjusted_positions.size == 0 or diameters.size == 0: continue
 
                 ax_part.plot(adjusted_positions, diameters, marker='.', linestyle=current_flute_style,
                              color=current_flute_color, markersize=3, label=f"{flute_model_name}")
@@ -637,7 +637,7 @@ class App(tk.Tk):
                 hole_diameters_part = part_data_dict.get("Holes diameter", [])
 
                 if hole_positions_part and hole_diameters_part:
-                    min_diam_this_part_this_flute = min(diameters) if diameters else 0
+                    min_diam_this_part_this_flute = float(diameters.min()) if diameters.size else 0.0
                     y_pos_for_holes = min_diam_this_part_this_flute - (5 + flute_idx * 1.5)
 
                     for h_pos, h_diam in zip(hole_positions_part, hole_diameters_part):